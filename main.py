@@ -1,9 +1,142 @@
-from fastapi import FastAPI, HTTPException, Query, Body
+from fastapi import FastAPI, HTTPException, Query, Body, Depends, Response
 from pydantic import BaseModel
+import anyio.to_thread
+from contextlib import asynccontextmanager
+from functools import partial
+import json
 import logging
-from model import ObjectPoolManagement, registered_types, InputTooLargeError
-from typing import Dict
+import threading
+from model import ObjectPoolManagement, registered_types, InputTooLargeError, get_type_adapter
+from typing import Callable, Dict, List, Optional, Type
 import os
+import sys
+
+# Retrieve the log level from environment variable. Defaults to WARNING, which skips building a log record for every
+# request in uvicorn's access log.
+log_level = os.getenv("LOG_LEVEL", "WARNING").upper()
+# Only configure logging if the server or an importing module has not already done so
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=log_level)
+logging.getLogger("uvicorn.access").setLevel(log_level)
+logger = logging.getLogger(__name__)
+
+class Message(BaseModel):
+    """
+    Model representing the response of an endpoint that changes a pool. Declaring it as the response model lets
+    FastAPI serialize responses with Pydantic instead of its Python JSON encoder.
+    """
+    message: str
+
+class AddedMessage(Message):
+    """
+    Model representing the response of a bulk add, with the number of objects added.
+    """
+    added: int
+
+# Dictionary to store pools for different types
+pools: Dict[str, ObjectPoolManagement] = {}
+# Endpoints run in a threadpool, so pool creation is guarded by a lock
+pools_lock = threading.Lock()
+
+# Default maximum pool size. Large enough for typical use while keeping a full pool's storage well under a gigabyte.
+DEFAULT_MAX_POOL_SIZE = 1 << 20
+
+def read_max_pool_size() -> int:
+    """
+    Read the maximum pool size from the MAX_POOL_SIZE environment variable, or use the default.
+
+    Raises:
+        ValueError: If the variable is not a positive integer.
+    """
+    value = int(os.getenv("MAX_POOL_SIZE", DEFAULT_MAX_POOL_SIZE))
+    if value < 1:
+        raise ValueError("MAX_POOL_SIZE must be a positive integer")
+    value = min(value, sys.maxsize // 16)
+    try:
+        memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        memory = None
+    # A pooled object takes at least one 8-byte slot, so a full pool of this size cannot fit in memory
+    if memory is not None and value > memory // 8:
+        logger.warning("MAX_POOL_SIZE of %d exceeds what %d bytes of memory can hold", value, memory)
+    return value
+
+def read_optional_positive_int(name: str) -> Optional[int]:
+    """
+    Read a positive integer setting from an environment variable, or None if the variable is unset.
+
+    Raises:
+        ValueError: If the variable is set but is not a positive integer.
+    """
+    if name not in os.environ:
+        return None
+    value = int(os.environ[name])
+    if value < 1:
+        raise ValueError(f"{name} must be a positive integer")
+    return value
+
+# Retrieve max_size from environment variable or use default.
+max_size = read_max_pool_size()
+# Retrieve the number of threads that endpoints can run in from environment variable. If unset, the AnyIO default of 40 is used.
+threadpool_size = read_optional_positive_int("THREADPOOL_SIZE")
+# Retrieve the path of a JSON file of objects to fill the pools with at startup from environment variable, if any.
+prefill_file = os.getenv("POOL_PREFILL_FILE")
+# Retrieve the reservoir size from environment variable. If set, pools keep a bounded random sample of the objects added to them.
+reservoir_size = read_optional_positive_int("POOL_RESERVOIR_SIZE")
+
+# Pool constructor for each registered type name, with the pool settings already applied. Only registered types have one.
+pool_constructors: Dict[str, Callable[[], ObjectPoolManagement]] = {
+    name: partial(ObjectPoolManagement, expected_type=object_type, max_size=max_size, reservoir_size=reservoir_size)
+    for name, object_type in registered_types.items()
+}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build the OpenAPI schema and the validators used by the pools before the first request arrives, so that
+    the first requests do not pay for building them. Also resize the threadpool the endpoints run in and prefill
+    the pools, if configured.
+    """
+    if threadpool_size is not None:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = threadpool_size
+    app.openapi()
+    for object_type in registered_types.values():
+        get_type_adapter(object_type)
+        get_type_adapter(List[object_type])
+    if prefill_file is not None:
+        prefill_pools(prefill_file)
+    yield
+
+def prefill_pools(path: str) -> None:
+    """
+    Create pools and fill them with the objects in a JSON file mapping type names to lists of objects. The objects of
+    each type are validated and added in one bulk add.
+
+    Args:
+        path (str): The path of the JSON file.
+
+    Raises:
+        ValueError: If the file names a type that is not registered, an object is not valid for its type, or a type has
+            more objects than its pool can hold.
+    """
+    with open(path) as f:
+        source = json.load(f)
+    unknown = [type_name for type_name in source if type_name not in registered_types]
+    if unknown:
+        raise ValueError(f"Cannot prefill pools for unregistered types: {', '.join(unknown)}")
+    for type_name, raw_objects in source.items():
+        with pools_lock:
+            pool = pools.get(type_name)
+            if pool is None:
+                pool = pools[type_name] = pool_constructors[type_name]()
+        try:
+            pool.add_objects_to_pool(raw_objects)
+        except InputTooLargeError:
+            raise ValueError(
+                f"Cannot prefill the {type_name} pool from {path}: {len(raw_objects)} objects exceed the remaining "
+                f"capacity of {pool.max_size - len(pool)} (MAX_POOL_SIZE is {pool.max_size})"
+            )
+        logger.info("Prefilled the %s pool with %d objects", type_name, len(raw_objects))
 
 app = FastAPI(
     title="Object Pool Management API",
@@ -16,9 +149,9 @@ app = FastAPI(
         "- **Remove object** from the pool.\n"
         "- **Retrieve a random object** from a specified pool.\n\n"
         "**Example Usage:**\n"
-        "To retrieve a random shirt from the 'Shirt' pool:\n\n"
+        "To retrieve a random shirt from the 'shirt' pool:\n\n"
         "```bash\n"
-        "curl -X GET \"http://localhost:8000/get-random/?type_name=Shirt\"\n"
+        "curl -X GET \"http://localhost:8000/get-random/shirt\"\n"
         "```\n"
         "**Response:**\n"
         "```json\n"
@@ -27,27 +160,11 @@ app = FastAPI(
         "    \"color\": \"blue\"\n"
         "}\n"
         "```\n\n"
-        "**Note:** Replace 'Shirt' with other object types as needed."
-    )
+        "**Note:** Replace 'shirt' with other object types as needed."
+    ),
+    lifespan=lifespan
 )
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-# Dictionary to store pools for different types
-pools: Dict[str, ObjectPoolManagement] = {}
-
-# Retrieve max_size from environment variable or use default. Default max size of list in Python is 536870912.
-max_size = int(os.getenv("MAX_POOL_SIZE", 536870912))
-
-class Shirt(BaseModel):
-    size: str
-    color: str
-
-class Book(BaseModel):
-    title: str
-    author: str
-
 @app.post("/create-pool/",
           summary="Create an Object Pool",
           description=(
@@ -67,6 +184,7 @@ class Book(BaseModel):
                 "```\n\n"
           ),
           tags=["Object Pool Management"],
+          response_model=Message,
           responses={
             200: {
                 "description": "Pool created successfully",
@@ -85,7 +203,7 @@ class Book(BaseModel):
                 }
             }
         })
-async def create_object_pool(type_name: str = Query(..., description="The object type name for which the pool is to be initialized.")):
+def create_object_pool(type_name: str = Query(..., description="The object type name for which the pool is to be initialized.")):
     """
     This endpoint allows for users to initialize an object pool for a specified type. 
     The specified type should match one of the registered object types.
@@ -96,93 +214,255 @@ async def create_object_pool(type_name: str = Query(..., description="The object
     Raises:
         HTTPException: If a pool for the specified object type already exists or if the object type is not registered.
     """
-    if type_name in pools:
-        raise HTTPException(status_code=400, detail="Pool for this type already exists")
-    if type_name not in registered_types:
-        raise HTTPException(status_code=400, detail="Type not registered")
-    pool_type = registered_types[type_name]
-    pools[type_name] = ObjectPoolManagement(expected_type=pool_type, max_size=max_size)
+    with pools_lock:
+        if pools.get(type_name) is not None:
+            raise HTTPException(status_code=400, detail="Pool for this type already exists")
+        pool_constructor = pool_constructors.get(type_name)
+        if pool_constructor is None:
+            raise HTTPException(status_code=400, detail="Type not registered")
+        pools[type_name] = pool_constructor()
     return {"message": f"Pool created for type {type_name}"}
 
-@app.get("/get-random/", 
-    summary="Retrieve a Random Object from Pool",
-    description=(
-        "**This endpoint retrieves a random object from a pool of the specified type.**\n\n"
-        "**Parameters:**\n"
-        "- **type_name** (str): The name of the object type pool from which a random object will be retrieved.\n\n"
-        "**Responses:**\n"
-        "- **200:** Successfully retrieved a random object.\n"
-        "- **404:** Pool not found or pool is empty.\n"
-        "\n **Example Usage:**\n"
-        "```bash\n"
-        "curl -X GET \"http://localhost:8000/get-random/?type_name=Shirt\"\n"
-        "```\n"
-        "**Response:**\n"
-        "```json\n"
-        "{\n"
-        "    \"size\": \"M\",\n"
-        "    \"color\": \"blue\"\n"
-        "}\n"
-        "```\n\n"
-    ),
-    tags=["Object Management"],
-    responses={
-        200: {
-            "description": "Random object retrieved successfully",
-            "content": {
-                "application/json": {
-                    "example": {
-                        "size": "M",
-                        "color": "blue"
-                    }
-                }
-            }
-        },
-        404: {
-            "description": "Pool not found or pool is empty",
-            "content": {
-                "application/json": {
-                    "example": {"detail": "No objects in the pool"}
-                }
+def make_get_random_handler(type_name: str):
+    """
+    Build the get-random endpoint for a registered type.
+
+    Args:
+        type_name (str): The object type name of the pool the endpoint retrieves from.
+    """
+    def get_random_object_from_pool():
+        """
+        This endpoint allows users to retrieve a random object from the specified object pool.
+
+        Raises:
+            HTTPException: If the pool is not found or is empty.
+        """
+        pool = pools.get(type_name)
+        if pool is None:
+            raise HTTPException(status_code=404, detail="Pool not found")
+        try:
+            # Return the already serialized object so FastAPI does not encode it again
+            return Response(content=pool.get_random_object_json(), media_type="application/json")
+        except IndexError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    return get_random_object_from_pool
+
+def make_capacity_check(type_name: str):
+    """
+    Build a dependency that rejects adds to a full pool. FastAPI resolves dependencies before it validates the
+    request body, so requests to a full pool are rejected without validating the objects they carry.
+
+    Args:
+        type_name (str): The object type name of the pool to check.
+    """
+    async def check_pool_capacity():
+        """
+        This dependency rejects the request if the pool it adds to is full.
+
+        Raises:
+            InputTooLargeError: If the pool has reached its maximum size.
+        """
+        pool = pools.get(type_name)
+        if pool is not None and pool.is_full():
+            raise InputTooLargeError()
+
+    return check_pool_capacity
+
+def make_add_object_handler(type_name: str, object_type: Type[BaseModel]):
+    """
+    Build the add-object endpoint for a registered type. The request body is declared with the concrete model,
+    so FastAPI validates it once against that model and no runtime type check is needed.
+
+    Args:
+        type_name (str): The object type name of the pool the endpoint adds to.
+        object_type (Type[BaseModel]): The model class registered for the type name.
+    """
+    def add_object_to_pool(
+        item: object_type = Body(
+            ...,
+            description="The object to be added to the pool, specified by the pool type.",
+            example={
+                "size": "M",
+                "color": "blue"
             }
-        }
-    }
-)
-async def get_random_object_from_pool(
-    type_name: str = Query(..., description="The object type name of the pool.")
-):
+        )
+    ):
+        """
+        This endpoint allows for users to add an object to a pool of that specified type. The pool must exist.
+
+        Args:
+            item (BaseModel): The object to be added to the pool. Must be of the expected type.
+
+        Raises:
+            HTTPException: If the pool of the specified type is not found.
+            InputTooLargeError: If the size of the pool is exceeded.
+        """
+        pool = pools.get(type_name)
+        if pool is None:
+            raise HTTPException(status_code=404, detail="Pool not found")
+        try:
+            pool.add_object_to_pool(item)
+            return {"message": "Object added successfully"}
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except InputTooLargeError as e:
+            raise e
+
+    return add_object_to_pool
+
+def make_add_objects_handler(type_name: str, object_type: Type[BaseModel]):
     """
-    This endpoint allows users to retrieve a random object from the specified object pool.
+    Build the bulk add-objects endpoint for a registered type, so that many objects can be added with one request.
 
     Args:
-        type_name (str): The object type name of the pool from which to retrieve a random object.
+        type_name (str): The object type name of the pool the endpoint adds to.
+        object_type (Type[BaseModel]): The model class registered for the type name.
+    """
+    def add_objects_to_pool(
+        items: List[object_type] = Body(
+            ...,
+            description="The objects to be added to the pool, specified by the pool type.",
+            example=[
+                {
+                    "size": "M",
+                    "color": "blue"
+                },
+                {
+                    "size": "L",
+                    "color": "red"
+                }
+            ]
+        )
+    ):
+        """
+        This endpoint allows for users to add several objects to a pool of that specified type. The pool must exist.
+        Either all of the objects are added or none of them are.
 
-    Raises:
-        HTTPException: If the pool is not found or is empty.
+        Args:
+            items (List[BaseModel]): The objects to be added to the pool. Must be of the expected type.
+
+        Raises:
+            HTTPException: If the pool of the specified type is not found.
+            InputTooLargeError: If the size of the pool would be exceeded.
+        """
+        pool = pools.get(type_name)
+        if pool is None:
+            raise HTTPException(status_code=404, detail="Pool not found")
+        try:
+            pool.add_objects_to_pool(items)
+            return {"message": "Objects added successfully", "added": len(items)}
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except InputTooLargeError as e:
+            raise e
+
+    return add_objects_to_pool
+
+def make_remove_object_handler(type_name: str, object_type: Type[BaseModel]):
     """
-    if type_name not in pools:
-        raise HTTPException(status_code=404, detail="Pool not found")
-    pool = pools[type_name]
-    try:
-        obj = pool.get_random_object_from_pool()
-        return obj.dict()
-    except IndexError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    Build the remove-object endpoint for a registered type. The request body is declared with the concrete model,
+    so FastAPI validates it once against that model and no runtime type check is needed.
+
+    Args:
+        type_name (str): The object type name of the pool the endpoint removes from.
+        object_type (Type[BaseModel]): The model class registered for the type name.
+    """
+    def remove_object_from_pool(
+        item: object_type = Body(
+            ...,
+            description="The object to be removed from the pool, specified by the pool type. The pool must exist.",
+            example={
+                "size": "M",
+                "color": "blue"
+            }
+        )
+    ):
+        """
+        This endpoint allows users to remove an object from the specified object pool. The pool must exist.
+
+        Args:
+            item (BaseModel): The object to be removed from the pool. Must be of the expected type.
 
-@app.post("/add-object/",
-          summary="Add an Object to Pool",
+        Raises:
+            HTTPException: If the pool of the specified type is not found or the object is not in the pool.
+        """
+        pool = pools.get(type_name)
+        if pool is None:
+            raise HTTPException(status_code=404, detail="Pool not found")
+        try:
+            pool.remove_object_from_pool(item)
+            return {"message": "Object removed successfully"}
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return remove_object_from_pool
+
+# Register the get-random, add, bulk add and remove endpoints for each registered type
+for registered_name, registered_type in registered_types.items():
+    app.add_api_route(f"/get-random/{registered_name}",
+        make_get_random_handler(registered_name),
+        methods=["GET"],
+        summary=f"Retrieve a Random Object from the {registered_name} Pool",
+        description=(
+            f"**This endpoint retrieves a random object from the {registered_name} pool.**\n\n"
+            "**Responses:**\n"
+            "- **200:** Successfully retrieved a random object.\n"
+            "- **404:** Pool not found or pool is empty.\n"
+            "\n **Example Usage:**\n"
+            "```bash\n"
+            f"curl -X GET \"http://localhost:8000/get-random/{registered_name}\"\n"
+            "```\n"
+            "**Response:**\n"
+            "```json\n"
+            "{\n"
+            "    \"size\": \"M\",\n"
+            "    \"color\": \"blue\"\n"
+            "}\n"
+            "```\n\n"
+        ),
+        tags=["Object Management"],
+        response_model=None,
+        responses={
+            200: {
+                "description": "Random object retrieved successfully",
+                "content": {
+                    "application/json": {
+                        "example": {
+                            "size": "M",
+                            "color": "blue"
+                        }
+                    }
+                }
+            },
+            404: {
+                "description": "Pool not found or pool is empty",
+                "content": {
+                    "application/json": {
+                        "example": {"detail": "No objects in the pool"}
+                    }
+                }
+            }
+        }
+    )
+    app.add_api_route(f"/add-object/{registered_name}",
+          make_add_object_handler(registered_name, registered_type),
+          methods=["POST"],
+          response_model=Message,
+          dependencies=[Depends(make_capacity_check(registered_name))],
+          summary=f"Add an Object to the {registered_name} Pool",
           description=(
-              "**This endpoint allows for users to add an object to a pool of that specified type. The pool must exist.**\n\n"
+              f"**This endpoint allows for users to add an object to the {registered_name} pool. The pool must exist.**\n\n"
               "**Parameters:**\n"
-              "- **type_name** (str): The object type name of the pool.\n"
-              "- **item** (BaseModel): The object to be added to the pool, specified by the pool type.\n\n"
+              f"- **item** ({registered_type.__name__}): The object to be added to the pool.\n\n"
               "**Responses:**\n"
               "- **200:** Object added successfully.\n"
-              "- **400:** Object type mismatch or pool size exceeded.\n"
+              "- **400:** Pool size exceeded.\n"
               "- **404:** Pool not found.\n"
+              "- **422:** The object is not a valid object of the pool type.\n"
               "\n **Example Usage:**\n"
                 "```bash\n"
-                "curl -X GET \"http://localhost:8000/add-object/?type_name=Shirt\"\n"
+                f"curl -X POST \"http://localhost:8000/add-object/{registered_name}\" -H \"Content-Type: application/json\" -d '{{\"size\": \"M\", \"color\": \"blue\"}}'\n"
                 "```\n"
                 "**Response:**\n"
                 "```json\n"
@@ -200,10 +480,10 @@ async def get_random_object_from_pool(
                 }
             },
             400: {
-                "description": "Object type mismatch or pool size exceeded",
+                "description": "Pool size exceeded",
                 "content": {
                     "application/json": {
-                        "example": {"detail": "Object type does not match pool type"}
+                        "example": {"detail": "Input list is too large."}
                     }
                 }
             },
@@ -216,56 +496,74 @@ async def get_random_object_from_pool(
                 }
             }
     })
-async def add_object_to_pool(type_name: str = Query(..., description="The object type name of the pool."),
-    item: BaseModel = Body(
-        ...,
-        description="The object to be added to the pool, specified by the pool type.",
-        example={
-            'Book': {
-                "title": "1984",
-                "author": "George Orwell"
+    app.add_api_route(f"/add-objects/{registered_name}",
+          make_add_objects_handler(registered_name, registered_type),
+          methods=["POST"],
+          response_model=AddedMessage,
+          dependencies=[Depends(make_capacity_check(registered_name))],
+          summary=f"Add Objects to the {registered_name} Pool",
+          description=(
+              f"**This endpoint allows for users to add a list of objects to the {registered_name} pool in one request. The pool must exist.**\n\n"
+              "**Parameters:**\n"
+              f"- **items** (List[{registered_type.__name__}]): The objects to be added to the pool.\n\n"
+              "**Responses:**\n"
+              "- **200:** Objects added successfully.\n"
+              "- **400:** Pool size exceeded. No objects are added.\n"
+              "- **404:** Pool not found.\n"
+              "- **422:** An object is not a valid object of the pool type.\n"
+              "\n **Example Usage:**\n"
+                "```bash\n"
+                f"curl -X POST \"http://localhost:8000/add-objects/{registered_name}\" -H \"Content-Type: application/json\" -d '[{{\"size\": \"M\", \"color\": \"blue\"}}, {{\"size\": \"L\", \"color\": \"red\"}}]'\n"
+                "```\n"
+                "**Response:**\n"
+                "```json\n"
+                "{ Objects added successfully, added: 2 } \n"
+                "```\n\n"
+          ),
+          tags=["Object Management"],
+          responses={
+            200: {
+                "description": "Objects added successfully",
+                "content": {
+                    "application/json": {
+                        "example": {"message": "Objects added successfully", "added": 2}
+                    }
+                }
+            },
+            400: {
+                "description": "Pool size exceeded",
+                "content": {
+                    "application/json": {
+                        "example": {"detail": "Input list is too large."}
+                    }
+                }
+            },
+            404: {
+                "description": "Pool not found",
+                "content": {
+                    "application/json": {
+                        "example": {"detail": "Pool not found"}
+                    }
+                }
             }
-        }
-    )
-):
-    """
-    This endpoint allows for users to add an object to a pool of that specified type. The pool type exist.
-
-    Args:
-        type_name (str): The object type name of the pool to add the object to.
-        item (BaseModel): The object to be added to the pool. Must be of the expected type.
-
-    Raises:
-        HTTPException: If the pool of the specified type is not found or the object type doesn't match.
-        InputTooLargeError: If the size of the pool is exceeded.
-    """
-    if type_name not in pools:
-        raise HTTPException(status_code=404, detail="Pool not found")
-    pool = pools[type_name]
-    if not isinstance(item, pool.expected_type):
-        raise HTTPException(status_code=400, detail="Object type does not match pool type")
-    try:
-        pool.add_object_to_pool(item)
-        return {"message": "Object added successfully"}
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except InputTooLargeError as e:
-        raise e
-
-@app.delete("/remove-object/",
-            summary="Remove an Object from Pool",
+    })
+    app.add_api_route(f"/remove-object/{registered_name}",
+            make_remove_object_handler(registered_name, registered_type),
+            methods=["DELETE"],
+            response_model=Message,
+            summary=f"Remove an Object from the {registered_name} Pool",
             description=(
-                "**This endpoint allows users to remove an object from the specified object pool.**\n\n"
+                f"**This endpoint allows users to remove an object from the {registered_name} pool.**\n\n"
                 "**Parameters:**\n"
-                "- **type_name** (str): The object type name of the pool.\n"
-                "- **item** (BaseModel): The object to be removed from the pool, specified by the pool type.\n\n"
+                f"- **item** ({registered_type.__name__}): The object to be removed from the pool.\n\n"
                 "**Responses:**\n"
                 "- **200:** Object removed successfully.\n"
                 "- **404:** Pool not found.\n"
-                "- **400:** Object type mismatch.\n"
+                "- **400:** Object not found in pool.\n"
+                "- **422:** The object is not a valid object of the pool type.\n"
                 "\n **Example Usage:**\n"
                 "```bash\n"
-                "curl -X GET \"http://localhost:8000/remove-object/?type_name=Shirt\"\n"
+                f"curl -X DELETE \"http://localhost:8000/remove-object/{registered_name}\" -H \"Content-Type: application/json\" -d '{{\"size\": \"M\", \"color\": \"blue\"}}'\n"
                 "```\n"
                 "**Response:**\n"
                 "```json\n"
@@ -291,48 +589,31 @@ async def add_object_to_pool(type_name: str = Query(..., description="The object
                     }
                 },
                 400: {
-                    "description": "Object type mismatch",
+                    "description": "Object not found in pool",
                     "content": {
                         "application/json": {
-                            "example": {"detail": "Object type does not match pool type"}
+                            "example": {"detail": "Object not found in pool"}
                         }
                     }
                 }
             })
-async def remove_object_from_pool(type_name: str = Query(..., description="The object type name of the pool."),
-    item: BaseModel = Body(
-        ...,
-        description="The object to be removed from the pool, specified by the pool type. The pool must exist.",
-        example={
-            'Shirt': {
-                "size": "M",
-                "color": "blue"
-            },
-            'Book': {
-                "title": "1984",
-                "author": "George Orwell"
-            }
-        }
-    )
-):
-    """
-    This endpoint allows users to remove an object from the specified object pool. The pool must exist.
-
-    Args:
-        type_name (str): The object type name of the pool to remove the object from.
-        item (BaseModel): The object to be removed from the pool. Must be of the expected type.
 
-    Raises:
-        HTTPException: If the pool of the specified type is not found or the object type doesn't match.
-    """
-    if type_name not in pools:
-        raise HTTPException(status_code=404, detail="Pool not found")
-    pool = pools[type_name]
-    if not isinstance(item, pool.expected_type):
-        raise HTTPException(status_code=400, detail="Object type does not match pool type")
-    try:
-        pool.remove_object_from_pool(item)
-        return {"message": "Object removed successfully"}
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+if __name__ == "__main__":
+    import uvicorn
 
+    # Pools live in process memory, so they are not shared between worker processes. Only run several workers
+    # (through the WEB_CONCURRENCY environment variable) if each client can be pinned to a single worker.
+    workers = int(os.getenv("WEB_CONCURRENCY", 1))
+    uvicorn.run(
+        # Worker processes need an import string. A single process serves this module's app without importing it again.
+        "main:app" if workers > 1 else app,
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", 8000)),
+        workers=workers,
+        # uvicorn.run resets the uvicorn loggers, so turn the access log off here unless LOG_LEVEL lets it through.
+        # The server's own messages, such as its startup banner, keep uvicorn's default level.
+        access_log=logging.getLogger("uvicorn.access").isEnabledFor(logging.INFO),
+        # Use uvloop and httptools when they are installed (uvloop is not on Windows), and fall back otherwise
+        loop="auto",
+        http="auto",
+    )
@@ -1,12 +1,29 @@
 from fastapi import HTTPException
-from pydantic import BaseModel
+from array import array
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError
 import random
-from typing import Type, List, Dict, TypeVar, Generic
+import os
+import threading
+from types import MappingProxyType
+from weakref import WeakValueDictionary
+from typing import Any, Callable, Type, List, Dict, Mapping, Tuple, Optional, TypeVar, Generic
 
 '''
 Type variable for generics
 '''
 T = TypeVar('T', bound=BaseModel)
+R = TypeVar('R')
+
+'''
+Number of slots allocated up front for a pool, so that filling a pool does not start with repeated list growth
+'''
+_INITIAL_CAPACITY = 1 << 16
+
+'''
+Default number of shards per pool, so that concurrent writers to one pool rarely wait on the same lock
+'''
+_DEFAULT_SHARDS = os.cpu_count() or 1
 
 '''
 Example data models
@@ -15,6 +32,8 @@ class Shirt(BaseModel):
     """
     Model representing a Shirt.
     """
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     size: str
     color: str
 
@@ -22,6 +41,8 @@ class Pants(BaseModel):
     """
     Model representing a Pants.
     """
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     size: str
     color: str
 
@@ -29,14 +50,17 @@ class Sock(BaseModel):
     """
     Model representing a Sock.
     """
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     size: str
     color: str
 
-registered_types: Dict[str, Type[BaseModel]] = {
+# Read-only, since the API builds its routes and pool constructors from the registered types at import time
+registered_types: Mapping[str, Type[BaseModel]] = MappingProxyType({
     "shirt": Shirt,
     "pants": Pants,
     "sock": Sock
-}
+})
 
 class InputTooLargeError(HTTPException):
     """
@@ -45,21 +69,232 @@ class InputTooLargeError(HTTPException):
     def __init__(self, detail: str = "Input list is too large."):
         super().__init__(status_code=400, detail=detail)
 
+@lru_cache(maxsize=None)
+def get_type_adapter(object_type: Any) -> TypeAdapter:
+    """
+    Return the TypeAdapter for a type, built on first use and shared by every pool that uses the type.
+    """
+    return TypeAdapter(object_type)
+
+def _object_key(obj: BaseModel) -> Tuple[Any, ...]:
+    """
+    Build a hashable key from the field values of an object, so that equal objects map to the same key.
+    """
+    return tuple(obj.__dict__.values())
+
+class _PoolShard(Generic[T]):
+    """
+    Section of an object pool holding the objects whose keys hash to it, guarded by its own lock.
+
+    Objects are stored column-wise rather than as model instances: each field has an array of integer codes, and each
+    code indexes a table of the distinct values seen for that field. Field values such as sizes and colors repeat a
+    lot, so this takes a few bytes per object instead of a full model instance. Objects are rebuilt when picked.
+
+    The positions of the objects with each key are kept in an array per key, and each object's offset in that array
+    is kept in one more column, so the index also takes a few bytes per object and removal stays O(1).
+    """
+    def __init__(self, object_type: Type[T], capacity: int, dump_json: Callable[[T], bytes]):
+        """
+        Initialize an empty shard.
+
+        Args:
+            object_type (Type[T]): The type of objects contained in the shard.
+            capacity (int): The number of slots allocated up front for the shard.
+            dump_json (Callable[[T], bytes]): Function serializing an object of the type to JSON.
+        """
+        self.object_type = object_type
+        self._dump_json = dump_json
+        self.fields: Tuple[str, ...] = tuple(object_type.model_fields)
+        # One array of value codes per field. Only the first self.size slots hold objects.
+        self.columns: List[array] = [array("I", [0]) * capacity for _ in self.fields]
+        # Distinct values of each field, and the code of each value
+        self.values: List[List[Any]] = [[] for _ in self.fields]
+        self.codes: List[Dict[Any, int]] = [{} for _ in self.fields]
+        # The per-field storage zipped once up front, so the hot loops below do not rebuild these tuples on every call
+        self._tables = tuple(zip(self.columns, self.values, self.codes))
+        self._readers = tuple(zip(self.columns, self.values))
+        self.size = 0
+        # Positions in the shard of the objects for each object key, for O(1) membership checks and removal
+        self.index: Dict[Tuple[Any, ...], array] = {}
+        # Offset of each object's position in the index array of its key. Only the first self.size slots are used.
+        self.offsets: array = array("I", [0]) * capacity
+        # JSON encoding of each object key in the shard
+        self.json: Dict[Tuple[Any, ...], bytes] = {}
+        self.lock = threading.Lock()
+        # Random generator owned by the shard, so picks do not share the global random instance.
+        # Indexes are drawn as int(random() * n), which is one C call instead of randrange's Python-level frames.
+        self._random = random.Random().random
+
+    def add(self, keys: List[Tuple[Any, ...]], objs: List[T]) -> None:
+        """
+        Add objects to the shard. The JSON encoding of an object is computed here when its key is new to the shard,
+        so that random retrieval never has to serialize.
+
+        Args:
+            keys (List[Tuple[Any, ...]]): The keys of the objects, i.e. their field values.
+            objs (List[T]): The objects, in the same order as their keys.
+        """
+        index = self.index
+        offsets = self.offsets
+        tables = self._tables
+        with self.lock:
+            size = self.size
+            for key, obj in zip(keys, objs):
+                positions = index.get(key)
+                if positions is None:
+                    positions = index[key] = array("I")
+                    self.json[key] = self._dump_json(obj)
+                if size < len(offsets):
+                    offsets[size] = len(positions)
+                else:
+                    offsets.append(len(positions))
+                positions.append(size)
+                for (column, values, codes), value in zip(tables, key):
+                    code = codes.get(value)
+                    if code is None:
+                        code = codes[value] = len(values)
+                        values.append(value)
+                    if size < len(column):
+                        column[size] = code
+                    else:
+                        column.append(code)
+                size += 1
+            self.size = size
+
+    def remove(self, key: Tuple[Any, ...]) -> None:
+        """
+        Remove an object with the given key from the shard.
+
+        Args:
+            key (Tuple[Any, ...]): The key of the object to be removed.
+
+        Raises:
+            ValueError: If no object with the key is found in the shard.
+        """
+        with self.lock:
+            positions = self.index.get(key)
+            if positions is None:
+                raise ValueError("Object not found in pool")
+            i = positions.pop()
+            if not positions:
+                del self.index[key]
+                self.json.pop(key, None)
+            # Shard order does not matter, so fill the gap with the last object instead of shifting the columns
+            n = self.size - 1
+            self.size = n
+            if i != n:
+                for column in self.columns:
+                    column[i] = column[n]
+                offset = self.offsets[i] = self.offsets[n]
+                self.index[self._row(i)][offset] = i
+
+    def _row(self, i: int) -> Tuple[Any, ...]:
+        """
+        Return the field values of the object at a position in the shard.
+        """
+        return tuple([values[column[i]] for column, values in self._readers])
+
+    def pick(self) -> Optional[T]:
+        """
+        Retrieve a random object from the shard.
+
+        Returns:
+            Optional[T]: A randomly selected object from the shard, or None if the shard is empty.
+        """
+        with self.lock:
+            size = self.size
+            if not size:
+                return None
+            row = self._row(int(self._random() * size))
+        return self._build(row)
+
+    def pick_json(self) -> Optional[bytes]:
+        """
+        Retrieve the JSON encoding of a random object from the shard. Encodings are stored when objects are added,
+        so the object is neither rebuilt nor serialized.
+
+        Returns:
+            Optional[bytes]: The JSON encoding of a randomly selected object, or None if the shard is empty.
+        """
+        with self.lock:
+            size = self.size
+            if not size:
+                return None
+            return self.json[self._row(int(self._random() * size))]
+
+    def _build(self, row: Tuple[Any, ...]) -> T:
+        """
+        Rebuild an object from its field values. The values were validated when the object was added, so the object
+        is built without validation.
+        """
+        return self.object_type.model_construct(**dict(zip(self.fields, row)))
+
 class ObjectPoolManagement(Generic[T]):
     """
     Class that manages a pool of objects.
+
+    Objects are spread over shards by the hash of their field values, so that equal objects always land in the
+    same shard and operations on different shards do not contend for the same lock.
+
+    If a reservoir size is given, the pool instead keeps a uniform random sample of at most that many of the objects
+    added to it (reservoir sampling), so its memory stays bounded however many objects are added. Objects cannot be
+    removed from a reservoir pool, and max_size does not limit how many objects can be added to it.
     """
-    def __init__(self, expected_type: Type[T], max_size: int):
+    def __init__(self, expected_type: Type[T], max_size: int, num_shards: int = _DEFAULT_SHARDS, reservoir_size: Optional[int] = None):
         """
         Initialize an object pool for a specified type. 
 
         Args:
             expected_type (Type[T]): The expected type of objects contained in the pool.
-            max_size (int): The maximum number of objects allowed in the pool. Default set to max size of list in Python: 536870912.
+            max_size (int): The maximum number of objects allowed in the pool.
+            num_shards (int): The number of shards the pool is split into. Defaults to the number of CPUs.
+            reservoir_size (Optional[int]): The number of objects kept in a reservoir pool. Defaults to None, which keeps every object.
+
+        Raises:
+            ValueError: If reservoir_size is not a positive integer.
         """
-        self.pool: List[T] = []
+        if reservoir_size is not None and reservoir_size < 1:
+            raise ValueError("reservoir_size must be a positive integer")
+        # Validators and serializer for the expected type
+        self._adapter = get_type_adapter(expected_type)
+        self._list_adapter = get_type_adapter(List[expected_type])
+        self.reservoir_size = reservoir_size
+        if reservoir_size is None:
+            capacity = min(max_size, _INITIAL_CAPACITY) // num_shards
+            self._shards: List[_PoolShard[T]] = [
+                _PoolShard(expected_type, capacity, self._adapter.dump_json) for _ in range(num_shards)
+            ]
+            self._num_shards = num_shards
+        else:
+            self._reservoir: List[Optional[T]] = [None] * reservoir_size
+            # JSON encoding of the object in each reservoir slot
+            self._reservoir_json: List[Optional[bytes]] = [None] * reservoir_size
+            # Number of objects ever added to the reservoir
+            self._seen = 0
+            # Reservoir objects by key, so that equal objects in the reservoir share one instance
+            self._interned: WeakValueDictionary[Tuple[Any, ...], T] = WeakValueDictionary()
+            # JSON encoding of each key in the reservoir and the number of slots holding it, so that equal objects
+            # are serialized once and share one encoding. An entry is dropped when its last slot is replaced.
+            self._encodings: Dict[Tuple[Any, ...], List[Any]] = {}
+        # Total number of objects in the pool, reserved before an object is added to its shard
+        self._size = 0
+        self._size_lock = threading.Lock()
         self.expected_type = expected_type
         self.max_size = max_size
+        # Random generator owned by the pool, so shard selection does not share the global random instance
+        self._random = random.Random().random
+
+    def __len__(self) -> int:
+        """
+        Return the number of objects in the pool.
+        """
+        return self._size
+
+    def is_full(self) -> bool:
+        """
+        Return whether the pool has reached its maximum size. A reservoir pool is never full.
+        """
+        return self.reservoir_size is None and self._size >= self.max_size
 
     def add_object_to_pool(self, obj: T) -> None:
         """
@@ -72,11 +307,94 @@ class ObjectPoolManagement(Generic[T]):
             InputTooLargeError: If the pool has reached its maximum size.
             ValueError: If the object type does not match the expected type.
         """
-        if not isinstance(obj, self.expected_type):
+        try:
+            obj = self._adapter.validate_python(obj)
+        except ValidationError:
+            raise ValueError("Object type does not match expected type")
+        if self.reservoir_size is not None:
+            self._add_objects_to_reservoir([obj])
+            return
+        key = _object_key(obj)
+        with self._size_lock:
+            if self._size >= self.max_size:
+                raise InputTooLargeError()
+            self._size += 1
+        self._shards[hash(key) % self._num_shards].add([key], [obj])
+
+    def add_objects_to_pool(self, objs: List[T]) -> None:
+        """
+        Add several objects to the pool. Either all of the objects are added or none of them are.
+
+        The objects are validated in one pass, and each shard is locked once for all of its objects.
+
+        Args:
+            objs (List[T]): Objects to be added to the pool.
+
+        Raises:
+            InputTooLargeError: If adding the objects would exceed the maximum size of the pool.
+            ValueError: If the type of any object does not match the expected type.
+        """
+        try:
+            objs = self._list_adapter.validate_python(objs)
+        except ValidationError:
             raise ValueError("Object type does not match expected type")
-        if len(self.pool) >= self.max_size:
-            raise InputTooLargeError()
-        self.pool.append(obj)
+        if self.reservoir_size is not None:
+            self._add_objects_to_reservoir(objs)
+            return
+        shards = self._shards
+        batches: Dict[int, Tuple[List[Tuple[Any, ...]], List[T]]] = {}
+        for obj in objs:
+            key = _object_key(obj)
+            i = hash(key) % self._num_shards
+            batch = batches.get(i)
+            if batch is None:
+                batch = batches[i] = ([], [])
+            batch[0].append(key)
+            batch[1].append(obj)
+        with self._size_lock:
+            if self._size + len(objs) > self.max_size:
+                raise InputTooLargeError()
+            self._size += len(objs)
+        for i, (keys, shard_objs) in batches.items():
+            shards[i].add(keys, shard_objs)
+
+    def _add_objects_to_reservoir(self, objs: List[T]) -> None:
+        """
+        Add objects to a reservoir pool. Once the reservoir is full, the n-th object added replaces a random
+        object in the reservoir with probability reservoir_size / n, so the reservoir stays a uniform sample.
+        An object equal to one already in the reservoir is stored as a reference to that instance and shares its
+        JSON encoding, so only objects new to the reservoir are serialized.
+
+        Args:
+            objs (List[T]): Objects to be added to the reservoir.
+        """
+        k = self.reservoir_size
+        keys = [_object_key(obj) for obj in objs]
+        interned = self._interned
+        encodings = self._encodings
+        reservoir = self._reservoir
+        dump_json = self._adapter.dump_json
+        with self._size_lock:
+            seen = self._seen
+            for key, obj in zip(keys, objs):
+                seen += 1
+                slot = seen - 1 if seen <= k else int(self._random() * seen)
+                if slot < k:
+                    encoding = encodings.get(key)
+                    if encoding is None:
+                        encoding = encodings[key] = [dump_json(obj), 0]
+                    encoding[1] += 1
+                    replaced = reservoir[slot]
+                    if replaced is not None:
+                        replaced_key = _object_key(replaced)
+                        replaced_encoding = encodings[replaced_key]
+                        replaced_encoding[1] -= 1
+                        if not replaced_encoding[1]:
+                            del encodings[replaced_key]
+                    reservoir[slot] = interned.setdefault(key, obj)
+                    self._reservoir_json[slot] = encoding[0]
+            self._seen = seen
+            self._size = min(seen, k)
 
     def remove_object_from_pool(self, obj: T) -> None:
         """
@@ -86,15 +404,22 @@ class ObjectPoolManagement(Generic[T]):
             obj (T): Object to be removed from the pool.
         
         Raises:
-            ValueError: If the object is not found in the pool.
+            ValueError: If the object is not found in the pool, or the pool is a reservoir pool.
         """
-        if obj not in self.pool:
+        if self.reservoir_size is not None:
+            raise ValueError("Objects cannot be removed from a reservoir pool")
+        if not isinstance(obj, self.expected_type):
             raise ValueError("Object not found in pool")
-        self.pool.remove(obj)
+        key = _object_key(obj)
+        self._shards[hash(key) % self._num_shards].remove(key)
+        with self._size_lock:
+            self._size -= 1
 
     def get_random_object_from_pool(self) -> T:
         """
         Retrieve a random object from the pool.
+
+        A shard is chosen with probability proportional to its size, then an object is chosen from that shard.
         
         Raises:
             IndexError: If the pool is empty.
@@ -102,6 +427,55 @@ class ObjectPoolManagement(Generic[T]):
         Returns:
             T: A randomly selected object from the pool.
         """
-        if not self.pool:
-            raise IndexError("No objects in the pool")
-        return random.choice(self.pool)
+        if self.reservoir_size is not None:
+            with self._size_lock:
+                size = self._size
+                if not size:
+                    raise IndexError("No objects in the pool")
+                return self._reservoir[int(self._random() * size)]
+        return self._pick_from_shards(_PoolShard.pick)
+
+    def get_random_object_json(self) -> bytes:
+        """
+        Retrieve the JSON encoding of a random object from the pool. Encodings are computed when objects are added,
+        so this does no serialization.
+
+        Raises:
+            IndexError: If the pool is empty.
+
+        Returns:
+            bytes: The JSON encoding of a randomly selected object from the pool.
+        """
+        if self.reservoir_size is not None:
+            with self._size_lock:
+                size = self._size
+                if not size:
+                    raise IndexError("No objects in the pool")
+                return self._reservoir_json[int(self._random() * size)]
+        return self._pick_from_shards(_PoolShard.pick_json)
+
+    def _pick_from_shards(self, pick: Callable[[_PoolShard[T]], Optional[R]]) -> R:
+        """
+        Choose a shard with probability proportional to its size, and pick from it.
+
+        Args:
+            pick (Callable[[_PoolShard[T]], Optional[R]]): Picks from a shard, returning None if the shard is empty.
+
+        Raises:
+            IndexError: If the pool is empty.
+        """
+        shards = self._shards
+        while True:
+            sizes = [shard.size for shard in shards]
+            total = sum(sizes)
+            if not total:
+                raise IndexError("No objects in the pool")
+            r = int(self._random() * total)
+            for shard, size in zip(shards, sizes):
+                if r < size:
+                    break
+                r -= size
+            picked = pick(shard)
+            # The shard may have been emptied since the sizes were read, in which case draw again
+            if picked is not None:
+                return picked
@@ -0,0 +1,96 @@
+import random
+import threading
+import unittest
+from collections import Counter
+
+from model import ObjectPoolManagement, Shirt, _object_key
+
+SIZES = ["S", "M", "L"]
+COLORS = ["red", "blue", "green", "black"]
+
+def random_shirt(rnd: random.Random) -> dict:
+    """
+    Build a raw shirt with a random size and color.
+    """
+    return {"size": rnd.choice(SIZES), "color": rnd.choice(COLORS)}
+
+class PoolIndexTest(unittest.TestCase):
+    """
+    Tests that the shard index stays consistent with the shard columns through adds, swap-removes and picks.
+    """
+    def assert_consistent(self, pool: ObjectPoolManagement, expected: Counter) -> None:
+        """
+        Check that each position in each key's index array points at a row with that key, that the offsets column
+        points back at the position, and that the pool holds exactly the expected objects.
+        """
+        held = Counter()
+        for shard in pool._shards:
+            self.assertEqual(set(shard.json), set(shard.index))
+            self.assertEqual(sum(len(positions) for positions in shard.index.values()), shard.size)
+            for key, positions in shard.index.items():
+                for offset, i in enumerate(positions):
+                    self.assertLess(i, shard.size)
+                    self.assertEqual(shard._row(i), key)
+                    self.assertEqual(shard.offsets[i], offset)
+                held[key] += len(positions)
+        self.assertEqual(held, +expected)
+        self.assertEqual(len(pool), sum(expected.values()))
+
+    def test_random_operations(self):
+        rnd = random.Random(0)
+        pool = ObjectPoolManagement(Shirt, max_size=100_000, num_shards=4)
+        expected = Counter()
+        for step in range(5_000):
+            operation = rnd.random()
+            if operation < 0.3 or not +expected:
+                raw = random_shirt(rnd)
+                pool.add_object_to_pool(raw)
+                expected[(raw["size"], raw["color"])] += 1
+            elif operation < 0.45:
+                raws = [random_shirt(rnd) for _ in range(rnd.randrange(1, 10))]
+                pool.add_objects_to_pool(raws)
+                expected.update((raw["size"], raw["color"]) for raw in raws)
+            elif operation < 0.9:
+                size, color = rnd.choice(list(+expected))
+                pool.remove_object_from_pool(Shirt(size=size, color=color))
+                expected[(size, color)] -= 1
+            else:
+                self.assertIn(_object_key(pool.get_random_object_from_pool()), +expected)
+            if step % 250 == 0:
+                self.assert_consistent(pool, expected)
+        self.assert_consistent(pool, expected)
+
+    def test_remove_missing_object(self):
+        pool = ObjectPoolManagement(Shirt, max_size=10)
+        pool.add_object_to_pool({"size": "M", "color": "blue"})
+        with self.assertRaises(ValueError):
+            pool.remove_object_from_pool(Shirt(size="M", color="red"))
+        self.assert_consistent(pool, Counter({("M", "blue"): 1}))
+
+    def test_concurrent_operations(self):
+        pool = ObjectPoolManagement(Shirt, max_size=100_000, num_shards=4)
+        expected = Counter()
+        expected_lock = threading.Lock()
+
+        def work(seed: int) -> None:
+            rnd = random.Random(seed)
+            added = []
+            for _ in range(500):
+                raw = random_shirt(rnd)
+                pool.add_object_to_pool(raw)
+                added.append((raw["size"], raw["color"]))
+                if rnd.random() < 0.5:
+                    size, color = added.pop(rnd.randrange(len(added)))
+                    pool.remove_object_from_pool(Shirt(size=size, color=color))
+            with expected_lock:
+                expected.update(added)
+
+        threads = [threading.Thread(target=work, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assert_consistent(pool, expected)
+
+if __name__ == "__main__":
+    unittest.main()